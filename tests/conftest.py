@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "soak: long-running memory soak benchmark; run with VISIBLE_LAYERS_SOAK=1")
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("VISIBLE_LAYERS_SOAK") == "1":
+        return
+    skip_soak = pytest.mark.skip(reason="soak benchmark; set VISIBLE_LAYERS_SOAK=1 to run")
+    for item in items:
+        if "soak" in item.keywords:
+            item.add_marker(skip_soak)
+
+
+@pytest.fixture(scope="session")
+def qgis_app():
+    from qgis.core import QgsApplication, QgsProject
+
+    app = QgsApplication([], True)
+    app.initQgis()
+    yield app
+    QgsProject.instance().clear()
+    app.exitQgis()
+
+
+@pytest.fixture(scope="session")
+def project_path(qgis_app, tmp_path_factory):
+    from soak import write_test_project
+
+    return write_test_project(str(tmp_path_factory.mktemp("project") / "soak.qgs"))
+
+
+@pytest.fixture
+def harness(qgis_app, project_path):
+    from qgis.core import QgsProject
+    from soak import FakeIface, SoakHarness, flush_events
+
+    harness = SoakHarness(FakeIface(), project_path)
+    harness.load_plugin()
+    yield harness
+    harness.unload_plugin()
+    QgsProject.instance().clear()
+    flush_events()
@@ -0,0 +1,387 @@
+"""Long-session soak harness for the Visible Layers plugin.
+
+Cycles project load/clear, dock toggles and plugin reloads under an
+offscreen QGIS and samples RSS, live Qt/Python object counts and the number
+of receivers on every signal the plugin connects to.  Run it directly for a
+report::
+
+    QT_QPA_PLATFORM=offscreen python tests/soak.py --cycles 5000
+
+tests/test_lifecycle.py drives the same harness and enforces the ceilings
+defined below when VISIBLE_LAYERS_SOAK=1 (see .github/workflows/soak.yml).
+"""
+import argparse
+import gc
+import os
+import subprocess
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qgis.PyQt.QtCore import QCoreApplication, QEvent, QItemSelectionModel, QObject, QTimer
+from qgis.PyQt.QtTest import QTest
+from qgis.PyQt.QtWidgets import (
+    QAction, QDockWidget, QMainWindow, QMenu, QToolBar, QVBoxLayout, QWidget,
+)
+from qgis.core import QgsApplication, QgsLayerTreeModel, QgsProject, QgsVectorLayer
+from qgis.gui import QgsLayerTreeView
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from visible_layers import DockWidgetArea, VisibleLayers  # noqa: E402
+
+# Allowed RSS slope (KiB per cycle, least-squares fit over every sample
+# taken after warm-up), per cycle type.  A leaked wrapper, dock or timer per
+# cycle costs at least a few KiB, so anything steeper is a leak rather than
+# allocator noise.  Override with VISIBLE_LAYERS_RSS_SLOPE_KB=<float>.
+RSS_SLOPE_CEILING_KB = {
+    "cycle_project": 1.0,
+    "cycle_dock": 0.5,
+    "cycle_plugin": 4.0,
+}
+OBJECT_GROWTH_CEILING = 0
+RECEIVER_GROWTH_CEILING = 0
+
+# initGui() schedules _add_action_to_dock_menu retries for up to 2 s; those
+# single-shot timers hold the instance until they fire.
+PLUGIN_SETTLE_MS = 2100
+
+DeferredDelete = getattr(getattr(QEvent, "Type", QEvent), "DeferredDelete")
+
+# Qt classes the plugin instantiates; counted as children of the main window.
+TRACKED_QT_TYPES = (QDockWidget, QToolBar, QAction, QMenu, QTimer, QItemSelectionModel)
+
+
+class FakeIface:
+    """Just enough of QgisInterface for the plugin: a main window holding a
+    Layers dock made of a toolbar and a QgsLayerTreeView on the project's
+    layer tree root."""
+
+    def __init__(self):
+        self._main_window = QMainWindow()
+        self._layer_tree_view = QgsLayerTreeView()
+        self._layer_tree_view.setModel(
+            QgsLayerTreeModel(QgsProject.instance().layerTreeRoot(), self._layer_tree_view))
+
+        panel = QWidget()
+        layout = QVBoxLayout()
+        layout.addWidget(QToolBar(panel))
+        layout.addWidget(self._layer_tree_view)
+        panel.setLayout(layout)
+
+        layers_dock = QDockWidget("Layers", self._main_window)
+        layers_dock.setObjectName("Layers")
+        layers_dock.setWidget(panel)
+        self._main_window.addDockWidget(DockWidgetArea.LeftDockWidgetArea, layers_dock)
+
+    def mainWindow(self):
+        return self._main_window
+
+    def layerTreeView(self):
+        return self._layer_tree_view
+
+    def addDockWidget(self, area, dock):
+        self._main_window.addDockWidget(area, dock)
+
+    def removeDockWidget(self, dock):
+        self._main_window.removeDockWidget(dock)
+
+    def setActiveLayer(self, layer):
+        self._layer_tree_view.setCurrentLayer(layer)
+
+    def showLayerProperties(self, layer):
+        pass
+
+    def actionZoomToLayer(self):
+        return None
+
+    def actionRenameLayer(self):
+        return None
+
+    def replace_layer_tree_model(self):
+        """Swap the Layers panel model, as a third-party plugin might."""
+        old_model = self._layer_tree_view.layerTreeModel()
+        model = QgsLayerTreeModel(QgsProject.instance().layerTreeRoot(), self._layer_tree_view)
+        self._layer_tree_view.setModel(model)
+        old_model.deleteLater()
+        return model
+
+
+def flush_events():
+    """Run pending events, including the plugin's deleteLater() calls."""
+    QCoreApplication.processEvents()
+    QCoreApplication.sendPostedEvents(None, DeferredDelete)
+    QCoreApplication.processEvents()
+
+
+def write_test_project(path):
+    """Write a project with a visible, an unchecked and a non-spatial layer
+    under a group, and return *path*."""
+    project = QgsProject.instance()
+    project.clear()
+    group = project.layerTreeRoot().addGroup("group")
+    for uri, name, visible in (
+            ("Point?crs=EPSG:4326", "points", True),
+            ("LineString?crs=EPSG:4326", "lines_off", False),
+            ("None", "table", True)):
+        layer = QgsVectorLayer(uri, name, "memory")
+        project.addMapLayer(layer, False)
+        group.addLayer(layer).setItemVisibilityChecked(visible)
+    project.write(path)
+    project.clear()
+    return path
+
+
+def rss_kb():
+    """Current resident set size of this process in KiB."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        # No procfs (macOS, BSD): ps reports the current RSS in KiB.
+        output = subprocess.check_output(["ps", "-o", "rss=", "-p", str(os.getpid())])
+        return int(output.strip())
+
+
+def receivers(obj, signal_name):
+    """Number of receivers connected to *signal_name* on *obj*.
+
+    receivers() is protected; PyQt only allows it on objects created from
+    Python, so this is used for FakeIface's view and model only.  Project
+    and layer tree root signals are checked with is_connected() instead.
+    """
+    return obj.receivers(getattr(obj, signal_name))
+
+
+def is_connected(signal, slot):
+    """True if *slot* is connected to *signal*.  Works on C++-created
+    objects, unlike receivers(): disconnect() fails if it was not."""
+    try:
+        signal.disconnect(slot)
+    except (RuntimeError, TypeError):
+        return False
+    signal.connect(slot)
+    return True
+
+
+def plugin_connections(plugin, iface):
+    """Map "signal -> slot" to the (signal, slot) pairs *plugin* connects to
+    objects it does not own."""
+    project = QgsProject.instance()
+    lt_view = iface.layerTreeView()
+    model = lt_view.layerTreeModel()
+    return {
+        "root.visibilityChanged": (
+            project.layerTreeRoot().visibilityChanged, plugin._on_visibility_changed),
+        "project.layerWasAdded": (project.layerWasAdded, plugin._on_layer_added),
+        "project.layerWillBeRemoved": (project.layerWillBeRemoved, plugin._on_any_change),
+        "project.readProject": (project.readProject, plugin._on_project_loaded),
+        "layerTreeView.currentLayerChanged": (
+            lt_view.currentLayerChanged, plugin._on_native_layer_changed),
+        "model.rowsRemoved": (model.rowsRemoved, plugin._on_model_changed),
+        "model.layoutChanged": (model.layoutChanged, plugin._on_model_changed),
+        "model.modelReset": (model.modelReset, plugin._on_model_changed),
+    }
+
+
+def rss_slope(samples):
+    """Least-squares RSS growth in KiB per cycle across *samples*."""
+    xs = [sample["cycle"] for sample in samples]
+    ys = [sample["rss_kb"] for sample in samples]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if not var_x:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+class SoakHarness:
+    """Drives one plugin instance (and its reloads) against a FakeIface."""
+
+    def __init__(self, iface, project_path):
+        self.iface = iface
+        self.project_path = project_path
+        self.plugin = None
+
+    # ── lifecycle ──────────────────────────────────────────────────────────
+
+    def load_plugin(self):
+        self.plugin = VisibleLayers(self.iface)
+        self.plugin.initGui()
+        return self.plugin
+
+    def unload_plugin(self):
+        if self.plugin is not None:
+            self.plugin.unload()
+            self.plugin = None
+        flush_events()
+
+    def cycle_project(self):
+        QgsProject.instance().read(self.project_path)
+        flush_events()
+        QgsProject.instance().clear()
+        flush_events()
+
+    def cycle_dock(self):
+        self.plugin.toggle_dock()
+        flush_events()
+        self.plugin.toggle_dock()
+        flush_events()
+
+    def cycle_plugin(self):
+        self.unload_plugin()
+        self.load_plugin()
+        self.plugin.toggle_dock()
+        flush_events()
+
+    # ── measurements ───────────────────────────────────────────────────────
+
+    def sample(self, settle_ms=0):
+        if settle_ms:
+            QTest.qWait(settle_ms)
+        gc.collect()
+        flush_events()
+        main_window = self.iface.mainWindow()
+        counts = {
+            qt_type.__name__: len(main_window.findChildren(qt_type))
+            for qt_type in TRACKED_QT_TYPES
+        }
+        counts["VisibleLayers"] = sum(
+            1 for obj in gc.get_objects() if isinstance(obj, VisibleLayers))
+        counts["QObject wrappers"] = sum(
+            1 for obj in gc.get_objects() if isinstance(obj, QObject))
+
+        lt_view = self.iface.layerTreeView()
+        model = lt_view.layerTreeModel()
+        signals = {
+            "model.rowsRemoved": receivers(model, "rowsRemoved"),
+            "model.layoutChanged": receivers(model, "layoutChanged"),
+            "model.modelReset": receivers(model, "modelReset"),
+            "layerTreeView.currentLayerChanged": receivers(lt_view, "currentLayerChanged"),
+        }
+        connections = {}
+        if self.plugin is not None:
+            connections = {
+                name: is_connected(signal, slot)
+                for name, (signal, slot) in plugin_connections(self.plugin, self.iface).items()
+            }
+        return {
+            "rss_kb": rss_kb(),
+            "objects": counts,
+            "receivers": signals,
+            "connections": connections,
+        }
+
+    def run(self, cycles, step, warmup=50, sample_every=100):
+        """Run *step* (a bound cycle_* method) *cycles* times and return the
+        samples taken after *warmup* cycles, every *sample_every* cycles."""
+        sample_every = max(1, sample_every)
+        settle_ms = PLUGIN_SETTLE_MS if step == self.cycle_plugin else 0
+        samples = []
+        for _ in range(warmup):
+            step()
+        samples.append(dict(self.sample(settle_ms), cycle=0, step=step.__name__))
+        for i in range(1, cycles + 1):
+            step()
+            if i % sample_every == 0 or i == cycles:
+                samples.append(dict(self.sample(settle_ms), cycle=i, step=step.__name__))
+        return samples
+
+
+def growth(samples):
+    """Difference between the last and the first sample, per metric."""
+    first, last = samples[0], samples[-1]
+    return {
+        "rss_kb": last["rss_kb"] - first["rss_kb"],
+        "rss_slope_kb": rss_slope(samples),
+        "objects": {k: v - first["objects"][k] for k, v in last["objects"].items()},
+        "receivers": {k: v - first["receivers"][k] for k, v in last["receivers"].items()},
+    }
+
+
+def rss_slope_ceiling(step_name):
+    override = os.environ.get("VISIBLE_LAYERS_RSS_SLOPE_KB")
+    return float(override) if override else RSS_SLOPE_CEILING_KB[step_name]
+
+
+def ceiling_violations(samples):
+    """Return a list of human-readable ceiling violations (empty if none).
+
+    The total QObject wrapper count is reported but not capped: it also
+    covers wrappers QGIS creates for the reloaded project itself.
+    """
+    violations = []
+    if len(samples) < 3:
+        return [f"only {len(samples)} samples; need at least 3 for a slope"]
+    first = samples[0]
+    for sample in samples[1:]:
+        for metric in ("objects", "receivers", "connections"):
+            if sample[metric].keys() != first[metric].keys():
+                violations.append(
+                    f"{metric} keys changed at cycle {sample['cycle']}: "
+                    f"{sorted(first[metric])} -> {sorted(sample[metric])}")
+        if sample["connections"] != first["connections"]:
+            violations.append(
+                f"plugin connections changed at cycle {sample['cycle']}: "
+                f"{first['connections']} -> {sample['connections']}")
+    if violations:
+        return violations
+
+    delta = growth(samples)
+    ceiling = rss_slope_ceiling(first["step"])
+    if delta["rss_slope_kb"] > ceiling:
+        violations.append(
+            f"RSS grows {delta['rss_slope_kb']:.2f} KiB/cycle (ceiling {ceiling})")
+    for name, diff in delta["objects"].items():
+        if name == "QObject wrappers":
+            continue
+        if diff > OBJECT_GROWTH_CEILING:
+            violations.append(f"{name} count grew by {diff}")
+    for name, diff in delta["receivers"].items():
+        if diff > RECEIVER_GROWTH_CEILING:
+            violations.append(f"{name} receivers grew by {diff}")
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--sample-every", type=int, default=250)
+    parser.add_argument("--project", default=os.path.join(
+        os.environ.get("TMPDIR", "/tmp"), "visible_layers_soak.qgs"))
+    args = parser.parse_args(argv)
+
+    app = QgsApplication([], True)
+    app.initQgis()
+    try:
+        iface = FakeIface()
+        harness = SoakHarness(iface, write_test_project(args.project))
+        harness.load_plugin()
+        harness.plugin.toggle_dock()
+
+        failed = False
+        for label, step in (("project load/clear", harness.cycle_project),
+                            ("dock toggle", harness.cycle_dock),
+                            ("plugin reload", harness.cycle_plugin)):
+            samples = harness.run(args.cycles, step, sample_every=args.sample_every)
+            delta = growth(samples)
+            print(f"{label}: {args.cycles} cycles, RSS {delta['rss_kb']:+d} KiB, "
+                  f"{delta['rss_slope_kb']:+.3f} KiB/cycle")
+            for name, diff in sorted(delta["objects"].items()):
+                print(f"    {name:32} {samples[-1]['objects'][name]:6d} ({diff:+d})")
+            for name, diff in sorted(delta["receivers"].items()):
+                print(f"    {name:32} {samples[-1]['receivers'][name]:6d} ({diff:+d})")
+            for name, connected in sorted(samples[-1]["connections"].items()):
+                print(f"    {name:32} {'connected' if connected else '-'}")
+            for violation in ceiling_violations(samples):
+                print(f"    FAIL: {violation}")
+                failed = True
+        harness.unload_plugin()
+    finally:
+        QgsProject.instance().clear()
+        app.exitQgis()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import os
+import weakref
+
+import pytest
+
+# Skip each test rather than the module (pytest.importorskip): a module
+# skipped at collection leaves no items, and pytest then exits with status 5.
+try:
+    from qgis.PyQt.QtCore import QItemSelectionModel, QModelIndex
+    from qgis.PyQt.QtTest import QTest
+    from qgis.core import QgsLayerTreeGroup, QgsProject
+
+    from soak import (
+        PLUGIN_SETTLE_MS, ceiling_violations, flush_events, is_connected, plugin_connections,
+    )
+except ImportError as exc:
+    pytestmark = pytest.mark.skip(reason=f"QGIS Python bindings not available: {exc}")
+
+SOAK_CYCLES = int(os.environ.get("VISIBLE_LAYERS_SOAK_CYCLES", 2000))
+
+
+def _hidden_rows(plugin):
+    """Map layer/group name -> whether its row is hidden in the VL panel."""
+    model = plugin.tree_view.model()
+    hidden = {}
+
+    def walk(parent):
+        for row in range(model.rowCount(parent)):
+            idx = model.index(row, 0, parent)
+            node = plugin._node_at(idx)
+            if node is None:
+                continue
+            hidden[node.name()] = plugin.tree_view.isRowHidden(row, parent)
+            if not hidden[node.name()] and isinstance(node, QgsLayerTreeGroup):
+                walk(idx)
+    walk(QModelIndex())
+    return hidden
+
+
+def _set_visible(name, visible):
+    layer = QgsProject.instance().mapLayersByName(name)[0]
+    QgsProject.instance().layerTreeRoot().findLayer(layer.id()).setItemVisibilityChecked(visible)
+
+
+# ── soak ──────────────────────────────────────────────────────────────────
+
+@pytest.mark.soak
+def test_soak_project_load_clear(harness):
+    harness.plugin.toggle_dock()
+    samples = harness.run(SOAK_CYCLES, harness.cycle_project)
+    assert ceiling_violations(samples) == []
+
+
+@pytest.mark.soak
+def test_soak_dock_toggle(harness):
+    QgsProject.instance().read(harness.project_path)
+    samples = harness.run(SOAK_CYCLES, harness.cycle_dock)
+    assert ceiling_violations(samples) == []
+
+
+@pytest.mark.soak
+def test_soak_plugin_reload(harness):
+    harness.plugin.toggle_dock()
+    cycles = max(3, SOAK_CYCLES // 10)
+    samples = harness.run(cycles, harness.cycle_plugin, warmup=5, sample_every=cycles // 4)
+    assert ceiling_violations(samples) == []
+    assert samples[-1]["objects"]["VisibleLayers"] == 1
+
+
+# ── lifecycle ─────────────────────────────────────────────────────────────
+
+def test_unload_releases_everything(harness):
+    harness.unload_plugin()
+    baseline = harness.sample(PLUGIN_SETTLE_MS)
+
+    harness.load_plugin()
+    harness.plugin.toggle_dock()
+    harness.plugin.act_toggle_auto.trigger()
+    harness.plugin._schedule_refresh()
+    connections = plugin_connections(harness.plugin, harness.iface)
+    assert [name for name, (signal, slot) in connections.items()
+            if not is_connected(signal, slot)] == []
+    unloaded = weakref.ref(harness.plugin)
+
+    harness.unload_plugin()
+    assert [name for name, (signal, slot) in connections.items()
+            if is_connected(signal, slot)] == []
+    del connections  # its bound methods keep the unloaded instance alive
+    after = harness.sample(PLUGIN_SETTLE_MS)
+    assert unloaded() is None
+
+    baseline["objects"].pop("QObject wrappers")
+    after["objects"].pop("QObject wrappers")
+    assert after["objects"] == baseline["objects"]
+    assert after["receivers"] == baseline["receivers"]
+    harness.load_plugin()
+
+
+def test_project_load_while_hidden_then_reopen(harness):
+    plugin = harness.plugin
+    plugin.toggle_dock()
+    plugin.toggle_dock()
+    assert not plugin.dock_is_open
+
+    new_model = harness.iface.replace_layer_tree_model()
+    QgsProject.instance().read(harness.project_path)
+    flush_events()
+    assert plugin._src_model is new_model
+    assert plugin.tree_view.model() is new_model
+
+    plugin.toggle_dock()
+    flush_events()
+    assert plugin.tree_view.model() is new_model
+    assert _hidden_rows(plugin) == {
+        "group": False, "points": False, "lines_off": True, "table": True,
+    }
+
+
+def test_auto_refresh_enabled_while_hidden_then_reload(harness):
+    plugin = harness.plugin
+    plugin.toggle_dock()
+    plugin.act_toggle_auto.trigger()
+    assert plugin.auto_refresh_enabled
+    plugin.toggle_dock()
+
+    receivers_before = harness.sample()["receivers"]
+    for _ in range(20):
+        harness.cycle_project()
+    QgsProject.instance().read(harness.project_path)
+    flush_events()
+    assert harness.sample()["receivers"] == receivers_before
+
+    plugin.toggle_dock()
+    flush_events()
+    assert _hidden_rows(plugin)["points"] is False
+
+    _set_visible("points", False)
+    QTest.qWait(200)
+    assert _hidden_rows(plugin)["group"] is True
+
+
+def test_model_swap_releases_selection_model(harness):
+    plugin = harness.plugin
+    plugin.toggle_dock()
+    counts = []
+    for _ in range(50):
+        model = harness.iface.replace_layer_tree_model()
+        QgsProject.instance().read(harness.project_path)
+        flush_events()
+        assert plugin._src_model is model
+        assert plugin.tree_view.model() is model
+        counts.append(len(plugin.tree_view.findChildren(QItemSelectionModel)))
+    assert counts[-1] == counts[0]
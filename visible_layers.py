@@ -271,8 +271,17 @@ class VisibleLayers:
 
         self._disconnect_model_signals()
 
+        # The timer is parented to the main window, so stopping it is not
+        # enough: it would outlive the plugin and keep a reference to
+        # _refresh_hidden (and thus to this instance) across reloads.
         if self._auto_timer:
             self._auto_timer.stop()
+            try:
+                self._auto_timer.timeout.disconnect(self._refresh_hidden)
+            except (RuntimeError, TypeError) as exc:
+                self._log_ignored_exception("Could not disconnect signal", exc)
+            self._auto_timer.deleteLater()
+            self._auto_timer = None
 
         if self.action:
             lt_view = self.iface.layerTreeView()
@@ -280,15 +289,19 @@ class VisibleLayers:
             toolbar = parent.findChild(QToolBar) if parent else None
             if toolbar:
                 toolbar.removeAction(self.action)
+            try:
+                self.action.triggered.disconnect(self.toggle_dock)
+            except (RuntimeError, TypeError) as exc:
+                self._log_ignored_exception("Could not disconnect signal", exc)
+            # Deleting the action also drops it from the Layers panel menu.
+            self.action.deleteLater()
             self.action = None
+        self._action_added_to_menu = False
 
-        if self.dock:
-            self.iface.removeDockWidget(self.dock)
-            self.dock = None
+        self._teardown_dock()
         if self.button:
             self.button.setParent(None)
             self.button = None
-        self.tree_view = None
         self._src_model = None
 
     # ── toolbar / menu injection ───────────────────────────────────────────
@@ -310,7 +323,8 @@ class VisibleLayers:
             QTimer.singleShot(delay, self._add_action_to_dock_menu)
 
     def _add_action_to_dock_menu(self):
-        if self._action_added_to_menu:
+        # A retry scheduled by initGui may still fire after unload().
+        if self._action_added_to_menu or self.action is None:
             return
         try:
             main_window = self.iface.mainWindow()
@@ -443,9 +457,11 @@ class VisibleLayers:
         toolbar.setIconSize(QSize(16, 16))
         toolbar.setStyleSheet("QToolBar { border: none; }")
 
+        # Toolbar actions are owned by the toolbar (not the main window) so
+        # they are destroyed together with the dock in _teardown_dock().
         refresh_action = QAction(
             QIcon(":/images/themes/default/mActionRefresh.svg"),
-            "Refresh", self.iface.mainWindow(),
+            "Refresh", toolbar,
         )
         refresh_action.triggered.connect(self._refresh_hidden)
         toolbar.addAction(refresh_action)
@@ -454,7 +470,7 @@ class VisibleLayers:
         icon_off = QIcon(icon_off_path)
         if icon_off.isNull():
             icon_off = QIcon.fromTheme("media-playback-stop")
-        self.act_toggle_auto = QAction(self.iface.mainWindow())
+        self.act_toggle_auto = QAction(toolbar)
         self.act_toggle_auto.setIcon(icon_off)
         self.act_toggle_auto.setToolTip("Activate Auto-refresh")
         self.act_toggle_auto.setCheckable(True)
@@ -464,14 +480,14 @@ class VisibleLayers:
 
         expand_action = QAction(
             QIcon(":/images/themes/default/mActionExpandTree.svg"),
-            "Expand All", self.iface.mainWindow(),
+            "Expand All", toolbar,
         )
         expand_action.triggered.connect(self.tree_view.expandAll)
         toolbar.addAction(expand_action)
 
         collapse_action = QAction(
             QIcon(":/images/themes/default/mActionCollapseTree.svg"),
-            "Collapse All", self.iface.mainWindow(),
+            "Collapse All", toolbar,
         )
         collapse_action.triggered.connect(self.tree_view.collapseAll)
         toolbar.addAction(collapse_action)
@@ -494,6 +510,36 @@ class VisibleLayers:
         if self.auto_refresh_enabled:
             self._connect_model_signals()
 
+    def _teardown_dock(self):
+        """Disconnect and destroy the dock created by _create_dock.
+
+        removeDockWidget() only detaches the dock from the main window, which
+        stays its parent — without an explicit deleteLater() the dock, tree
+        view, toolbar and their connections survive every plugin reload.
+        """
+        if self.tree_view is not None:
+            for sig, slot in [
+                (self.tree_view.customContextMenuRequested, self._show_context_menu),
+                (self.tree_view.doubleClicked, self._on_double_clicked),
+                (self.tree_view.clicked, self._on_clicked),
+            ]:
+                try:
+                    sig.disconnect(slot)
+                except (RuntimeError, TypeError) as exc:
+                    self._log_ignored_exception("Could not disconnect signal", exc)
+            self.tree_view = None
+
+        if self.dock:
+            try:
+                self.dock.visibilityChanged.disconnect(self._update_dock_state)
+            except (RuntimeError, TypeError) as exc:
+                self._log_ignored_exception("Could not disconnect signal", exc)
+            self.iface.removeDockWidget(self.dock)
+            self.dock.deleteLater()
+            self.dock = None
+        self.act_toggle_auto = None
+        self.dock_is_open = False
+
     def _update_dock_state(self, visible):
         self.dock_is_open = visible
         if not visible:
@@ -525,17 +571,28 @@ class VisibleLayers:
             self._schedule_refresh()
 
     def _on_project_loaded(self):
-        if not self.dock_is_open or self.tree_view is None:
+        # Swap the model even while the dock is hidden, otherwise reopening
+        # it would show (and stay connected to) the previous project's model.
+        if self.tree_view is None:
             return
         lt_view = self.iface.layerTreeView()
         new_model = lt_view.layerTreeModel()
         if new_model is not self._src_model:
             self._disconnect_model_signals()   # disconnects both always-on and auto-refresh
+            # Stock QGIS keeps one layerTreeModel() for the whole session and
+            # only clears its root, so this branch is for a view whose model
+            # was replaced. setModel() does not delete the selection model
+            # it replaces; without this, one piles up per swap
+            # (tests/test_lifecycle.py::test_model_swap_releases_selection_model).
+            old_selection_model = self.tree_view.selectionModel()
             self._src_model = new_model
             self.tree_view.setModel(self._src_model)
+            if old_selection_model is not None:
+                old_selection_model.deleteLater()
             if self.auto_refresh_enabled:
                 self._connect_model_signals()
-        self._refresh_hidden()
+        if self.dock_is_open:
+            self._refresh_hidden()
 
     def _schedule_refresh(self, delay_ms=60):
         """Debounce rapid-fire changes before calling _refresh_hidden."""
@@ -636,6 +693,7 @@ class VisibleLayers:
                 if act:
                     menu.addAction(act)
             menu.exec(self.tree_view.mapToGlobal(pos))
+            menu.deleteLater()
 
         elif isinstance(node, QgsLayerTreeGroup):
             if lt_view:
@@ -654,3 +712,4 @@ class VisibleLayers:
             menu.addAction(act_expand)
             menu.addAction(act_collapse)
             menu.exec(self.tree_view.mapToGlobal(pos))
+            menu.deleteLater()